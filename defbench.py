@@ -16,44 +16,72 @@ print(f)
 ```
 '''
 
+import os
 import sys
+import pickle
+import functools
 import timeit
-from io import StringIO
-from typing import Callable, List
+import tracemalloc
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from io import StringIO, TextIOBase
+from typing import Any, Callable, ClassVar, Deque, Dict, Iterator, List, Optional, Tuple, Union
 from memory_profiler import memory_usage
 
 class TestRunningException(Exception): pass
 
+class _RingBuf(TextIOBase):
+    '''
+    Text stream that only keeps the last `size` writes, so that capturing the
+    output of functions which print a lot doesn't grow without bound.
+    '''
+    def __init__(self, size: int):
+        self._chunks: Deque[str] = deque(maxlen=size)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self._chunks.append(s)
+        return len(s)
+
+    def getvalue(self) -> str:
+        return ''.join(self._chunks)
+
 class TestRun:
     '''
     Represents the results after running a benchmark test. Contains information
     about the name of the function ran, average time for completion, and average
     memory usage.
     '''
+    __slots__ = ('_func', '_mem', '__mem_raw', '_initial', '_peak', '_name', '_seq', 'time', 'stdout', 'stderr', 'repeat', 'backend')
+
     _func: Callable
-    _mem: List[float]
+    _mem: np.ndarray
     __mem_raw: List[float]
-    name: str
+    _initial: Optional[float]
+    _peak: Optional[float]
+    _name: str
+    # the run's position in the module history, or -1 if it isn't in it
+    _seq: int
     time: float
     stdout: str
     stderr: str
     repeat: int
+    backend: Optional[str]
 
-    def __init__(self, func: Callable, name: str = None, repeat: int = 1, memory: List[float] = [], time: float = 0.0, stdout: str = "", stderr: str = ""):
+    def __init__(self, func: Callable, name: Optional[str] = None, repeat: int = 1, memory: List[float] = [], time: float = 0.0, stdout: str = "", stderr: str = "", backend: Optional[str] = None):
         self._func = func
-        if name:
-            self.name = name
-        else:
-            try:
-                self.name = func.__code__.co_name
-            except:
-                self.name = "<function>"
+        self._name = name or str(getattr(func, '__name__', '<function>'))
+        self._seq = -1
         self.repeat = repeat
         self._mem_raw = memory
         self.time = time
         self.stdout = stdout
         self.stderr = stderr
-        history.add(self)
+        self.backend = backend
 
     @property
     def _mem_raw(self) -> List[float]:
@@ -68,28 +96,57 @@ class TestRun:
         # keep a copy of the raw memory data
         self.__mem_raw = values
         
-        # and normalize what we'll *actually* use
-        if values:
-            initial = values[0]
-            self._mem = [x - initial for x in values]
+        # and normalize what we'll *actually* use in a single vectorized step.
+        # memory_profiler reports in steps of 1/256 MiB, which float32 holds
+        # exactly up to 64GiB in half the space of float64
+        arr = np.fromiter(values, dtype=np.float32, count=len(values))
+        if arr.size:
+            self._initial = float(values[0])
+            self._mem = arr - arr[0]
+            self._peak = float(self._mem.max())
         else:
-            self._mem = []
+            self._initial = None
+            self._mem = arr
+            self._peak = None
+
+    def _set_peak(self, peak: float, initial: float) -> None:
+        '''
+        Record only the peak (normalized) and initial memory usage, without
+        keeping any of the individual memory usage slices around.
+        '''
+        self.__mem_raw = []
+        self._mem = np.empty(0, dtype=np.float32)
+        self._initial = initial
+        self._peak = peak
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        old = self._name
+        self._name = value
+        # keep the history's name index in step with the new name
+        if self._seq >= 0 and value != old:
+            history._rename(self, old, self._seq)
 
     @property
     def func(self) -> Callable:
         return self._func
 
     @property
-    def memory(self) -> float:
-        if self._mem:
-            return max(self._mem)
-        return None
+    def memory(self) -> Optional[float]:
+        return self._peak
     
     def __str__(self) -> str:
         output = f"<TestRun '{self.name}'\n"
         output += f'    runs:         {self.repeat:,}\n'
-        output += f'    avg time: {self.time:.4}s\n'
-        output += f'    avg mem:    {self.memory:.4}Mib>'
+        output += f'    avg time per call: {self.time:.4}s\n'
+        if self.memory is None:
+            output += '    avg mem:    n/a>'
+        else:
+            output += f'    avg mem:    {self.memory:.4}Mib>'
         return output
     
     def __repr__(self) -> str:
@@ -100,38 +157,144 @@ class history:
     Keeps a record of all TestRuns created by either the module level `.run()`
     method or `Test.run()`. Provides methods for retrieving information about
     previous TestRuns, optionally based on filters.
+
+    Alongside the TestRuns themselves, the time and peak memory of each run are
+    kept in parallel lists with running totals, and the runs are indexed by
+    name (following any later renames), so that unfiltered averages and name
+    lookups don't need to walk every TestRun.
+
+    Only the most recent `CAPACITY` TestRuns are kept, so long sessions don't
+    hold on to every run forever. `CAPACITY` is only the default and is meant
+    to be read-only; use `.set_capacity()` to change how many are kept.
     '''
-    _history: List[TestRun] = []
+    CAPACITY: ClassVar[int] = 10_000
+
+    _history: ClassVar[Deque[TestRun]] = deque(maxlen=CAPACITY)
+    _times: ClassVar[Deque[float]] = deque(maxlen=CAPACITY)
+    _mems: ClassVar[Deque[Optional[float]]] = deque(maxlen=CAPACITY)
+    # the name each run is indexed under, so the oldest run can be unindexed
+    # without trusting its current name
+    _names: ClassVar[Deque[str]] = deque(maxlen=CAPACITY)
+    _time_total: ClassVar[float] = 0.0
+    _mem_total: ClassVar[float] = 0.0
+    _mem_count: ClassVar[int] = 0
+    # the runs for each name in the order they were added, ordered by the
+    # `_seq` each run is given when it's added
+    _by_name: ClassVar[Dict[str, Deque[TestRun]]] = {}
+    _next_seq: ClassVar[int] = 0
 
     @staticmethod
-    def average_time(filter: Callable = None) -> float:
+    def average_time(filter: Optional[Callable] = None) -> float:
         '''
         Return the average time for all TestRuns in the history. Optionally,
         pass a function which accepts a single argument to filter results
         (see `.get()`)
         '''
+        if filter is None:
+            return history.average_time_fast()
         runs = history.get(filter)
+        if not runs:
+            raise ValueError('No TestRuns to average')
         total = sum([r.time for r in runs])
         return total / len(runs)
 
     @staticmethod
-    def average_memory(filter: Callable = None) -> float:
+    def average_memory(filter: Optional[Callable] = None) -> float:
         '''
-        Return the average memory usage (MiB) for all TestRuns in the history.
-        Optionally, pass a function which accepts a single argument to filter
-        results (see `.get()`)
+        Return the average memory usage (MiB) for all TestRuns in the history
+        that measured memory. Optionally, pass a function which accepts a single
+        argument to filter results (see `.get()`)
         '''
-        runs = history.get(filter)
-        total = sum([r.memory for r in runs])
-        return total / len(runs)
+        if filter is None:
+            return history.average_memory_fast()
+        peaks = [r._peak for r in history.get(filter) if r._peak is not None]
+        if not peaks:
+            raise ValueError('No TestRuns with measured memory to average')
+        return sum(peaks) / len(peaks)
+
+    @staticmethod
+    def average_time_fast() -> float:
+        '''
+        Return the average time for all TestRuns in the history, computed from
+        the running total rather than the TestRuns themselves.
+        '''
+        if not history._times:
+            raise ValueError('No TestRuns to average')
+        return history._time_total / len(history._times)
+
+    @staticmethod
+    def average_memory_fast() -> float:
+        '''
+        Return the average memory usage (MiB) for all TestRuns in the history
+        that measured memory, computed from the running total rather than the
+        TestRuns themselves.
+        '''
+        if not history._mem_count:
+            raise ValueError('No TestRuns with measured memory to average')
+        return history._mem_total / history._mem_count
 
     @staticmethod
     def add(run: TestRun) -> None:
-        if isinstance(run, TestRun):
-            history._history.append(run)
+        runs = history._history
+        if len(runs) == runs.maxlen:
+            # the oldest run is about to be dropped, so unindex it first
+            oldest = history._names[0]
+            named = history._by_name[oldest]
+            named.popleft()._seq = -1
+            if not named:
+                del history._by_name[oldest]
+            history._time_total -= history._times[0]
+            if history._mems[0] is not None:
+                history._mem_total -= history._mems[0]
+                history._mem_count -= 1
+        run._seq = history._next_seq
+        history._next_seq += 1
+        history._by_name.setdefault(run.name, deque()).append(run)
+        runs.append(run)
+        history._times.append(run.time)
+        history._mems.append(run._peak)
+        history._names.append(run.name)
+        history._time_total += run.time
+        if run._peak is not None:
+            history._mem_total += run._peak
+            history._mem_count += 1
 
     @staticmethod
-    def get(filter: Callable = None) -> List[TestRun]:
+    def filter(name: Optional[str] = None, name_startswith: Optional[str] = None) -> List[TestRun]:
+        '''
+        Return all TestRuns with the given `name`, or whose name starts with
+        `name_startswith`, using the name index instead of checking every
+        TestRun (see `.get()` for arbitrary filters)
+        '''
+        groups: List[Deque[TestRun]] = []
+        if name is not None and name in history._by_name:
+            groups.append(history._by_name[name])
+        if name_startswith is not None:
+            for key, named in history._by_name.items():
+                if key.startswith(name_startswith) and key != name:
+                    groups.append(named)
+        if len(groups) == 1:
+            return list(groups[0])
+        return sorted([r for named in groups for r in named], key=lambda r: r._seq)
+
+    @staticmethod
+    def _rename(run: TestRun, old: str, seq: int) -> None:
+        # move a renamed run to its new name in the index, keeping each name's
+        # runs in the order they were added
+        named = history._by_name[old]
+        named.remove(run)
+        if not named:
+            del history._by_name[old]
+        named = history._by_name.setdefault(run.name, deque())
+        i = len(named)
+        # renamed runs are usually among the newest, so look from the end
+        while i and named[i - 1]._seq > seq:
+            i -= 1
+        named.insert(i, run)
+        history._names[seq - history._history[0]._seq] = run.name
+
+    @staticmethod
+    def get(filter: Optional[Callable] = None) -> List[TestRun]:
         '''
         Return all TestRuns from the history. Optionally, pass a function that
         accepts a single argument to filter results, e.g.:
@@ -141,82 +304,320 @@ class history:
         history.get(lambda x: x.time > 10))
         ```
         '''
-        if filter:
+        if filter is not None:
             return [x for x in history._history if filter(x)]
-        return history._history
+        return list(history._history)
+
+    @staticmethod
+    def clear() -> None:
+        '''
+        Remove all TestRuns from the history.
+        '''
+        for run in history._history:
+            run._seq = -1
+        history._history.clear()
+        history._times.clear()
+        history._mems.clear()
+        history._names.clear()
+        history._by_name.clear()
+        history._time_total = 0.0
+        history._mem_total = 0.0
+        history._mem_count = 0
+
+    @staticmethod
+    def set_capacity(capacity: Optional[int]) -> None:
+        '''
+        Set the maximum number of TestRuns kept in the history, dropping the
+        oldest ones if there are already more than that. Pass None to keep
+        every TestRun.
+        '''
+        if capacity is not None and capacity < 1:
+            raise ValueError('History capacity must be at least 1')
+        runs = list(history._history)
+        if capacity is not None:
+            runs = runs[-capacity:]
+        history.clear()
+        history._history = deque(maxlen=capacity)
+        history._times = deque(maxlen=capacity)
+        history._mems = deque(maxlen=capacity)
+        history._names = deque(maxlen=capacity)
+        for run in runs:
+            history.add(run)
 
 class Test:
     '''
     Class used for running tests on a function. Stores the function to use along
     with default values for each test. Tests can be run using `.run()`, and each
     test is available via the `.history` attribute.
+
+    `args` and `kwargs` are bound to the function once with `functools.partial`
+    and passed to it on every call.
+
+    Set `jit` to compile the function with numba's `njit` before running it.
+    This only works for pure numeric kernels that numba can compile in nopython
+    mode (no arbitrary python objects, and globals are frozen at compile time).
+    The function is called once during initialization so that compilation
+    isn't included in any of the timings.
+
+    Each run times `repeat` calls `outer_repeat` times over and keeps the
+    fastest batch, which filters out timer and scheduling noise. Calls are
+    unrolled up to `UNROLL` at a time so that the timing loop itself adds as
+    little as possible to cheap functions.
+
+    `setup` is called (untimed) before each batch, e.g. to reset any state
+    the function modifies. State changed by one call is still there for the
+    next call in the same batch, though. Set `setup_every_call` to call
+    `setup` before every single call instead; each call is then timed on its
+    own, which adds the overhead of reading the timer to every call.
+
+    Output printed by the function is stored on each TestRun according to
+    `capture_stdout`: "full" (or True) keeps all of it, "ring" keeps only the
+    last `ring_size` writes, and "off" (or False) sends it straight to
+    /dev/null.
+
+    Memory is measured with `backend`, either "memory_profiler" (samples the
+    whole process' memory usage every 0.05s) or "tracemalloc" (exact peak of
+    python allocations, which suits functions too short for the sampler to
+    catch). Since tracing slows allocations down, tracemalloc measures memory
+    in its own pass apart from the timed one, so each run takes about twice
+    as long. By default (`backend` None), memory_profiler is used and runs
+    that are over before it gets enough slices are measured with tracemalloc
+    instead. The backend used is stored as `TestRun.backend`.
     '''
+    UNROLL: ClassVar[int] = 8
+    # fewest memory_profiler slices that are trusted to have caught the peak
+    MIN_SLICES: ClassVar[int] = 5
+
+    __slots__ = ('_func', '_setup', '_repeat', '_outer_repeat', '_running', '_backend', '_keep_raw', '_capture_stdout', '_ring_size', '_setup_every_call', 'name', 'history')
+
     _func: Callable
+    _setup: Optional[Callable]
+    _setup_every_call: bool
     _repeat: int
+    _outer_repeat: int
     _running: bool
-    name: str
+    _backend: Optional[str]
+    _keep_raw: bool
+    _capture_stdout: str
+    _ring_size: int
+    name: Optional[str]
     history: List[TestRun]
 
-    def __init__(self, func: Callable, repeat: int = 10, name: str = None):
+    def __init__(self, func: Callable, repeat: int = 10, name: Optional[str] = None, keep_raw: bool = False, jit: bool = False, outer_repeat: int = 5, capture_stdout: Union[bool, str] = True, setup: Optional[Callable] = None, backend: Optional[str] = None, args: tuple = (), kwargs: Optional[dict] = None, ring_size: int = 1024, setup_every_call: bool = False):
+        if outer_repeat < 1:
+            raise ValueError('outer_repeat must be at least 1')
+        if backend not in (None, 'memory_profiler', 'tracemalloc'):
+            raise ValueError(f'Unknown memory backend "{backend}"')
+        if capture_stdout is True:
+            capture_stdout = 'full'
+        elif capture_stdout is False:
+            capture_stdout = 'off'
+        if capture_stdout not in ('full', 'ring', 'off'):
+            raise ValueError(f'Unknown stdout capture mode "{capture_stdout}"')
+        if jit or args or kwargs:
+            name = name or getattr(func, '__name__', None)
+        if jit:
+            from numba import njit
+            func = njit(cache=True, fastmath=True)(func)
+        if args or kwargs:
+            func = functools.partial(func, *args, **(kwargs or {}))
         self._func = func
+        self._setup = setup
+        self._setup_every_call = setup_every_call
         self.name = name
         self._repeat = repeat
+        self._outer_repeat = outer_repeat
+        self._backend = backend
+        self._keep_raw = keep_raw
+        self._capture_stdout = capture_stdout
+        self._ring_size = ring_size
         self._running = False
         self.history = []
+        if jit:
+            # warm up outside of the timed region to trigger compilation, with
+            # the same setup and output capture as a timed call (the output is
+            # thrown away)
+            with self._capture():
+                if setup is not None:
+                    setup()
+                func()
     
-    def _run(self, repeat: int, name: str) -> None:
+    def _run(self, repeat: int, name: Optional[str], traced: bool = False) -> float:
+        # returns the peak python allocation size (MiB) of the timed calls if
+        # `traced` is set (and tracemalloc is tracing), otherwise 0.0
         # create new test instance
         test_run = TestRun(self._func, repeat=repeat, name=name)
 
+        # run the function
+        peak = 0.0
+        with self._capture() as (new_stdout, new_stderr):
+            batches = self._make_timer(repeat)
+            if traced:
+                # only count what the calls allocate, not the timing harness.
+                # reset_peak() is new in python 3.9; before that the peak can
+                # only be reset by dropping every trace collected so far
+                if hasattr(tracemalloc, 'reset_peak'):
+                    tracemalloc.reset_peak()
+                else:
+                    tracemalloc.clear_traces()
+                baseline, _ = tracemalloc.get_traced_memory()
+            test_run.time = min(batches()) / repeat
+            if traced:
+                _, traced_peak = tracemalloc.get_traced_memory()
+                peak = (traced_peak - baseline) / 2**20
+
+        # get output of the function from our fake variable
+        test_run.stdout = new_stdout.getvalue()
+        test_run.stderr = new_stderr.getvalue()
+
+        self.history.append(test_run)
+        return peak
+
+    @contextmanager
+    def _capture(self) -> Iterator[Tuple[Union[StringIO, _RingBuf], StringIO]]:
         # store the normal output file descriptors...
         old_stdout = sys.stdout
         old_stderr = sys.stderr
+        new_stdout: Union[StringIO, _RingBuf] = StringIO()
+        new_stderr = StringIO()
+        saved_fd = None
+        devnull_stdout = None
 
-        # ...so that we can redirect all output for ourselves
-        sys.stdout = StringIO()
-        sys.stderr = StringIO()
+        # ...so that we can redirect all output for ourselves. the swap is
+        # done once around the whole timer, not once per call
+        if self._capture_stdout == 'ring':
+            new_stdout = _RingBuf(self._ring_size)
+        if self._capture_stdout != 'off':
+            sys.stdout = new_stdout
+        else:
+            # discard output both at the python level (sys.stdout may not be
+            # fd 1, e.g. in jupyter or under an outer redirect) and at the file
+            # descriptor level so that writes don't get buffered anywhere.
+            # new_stdout is left empty
+            sys.stdout.flush()
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            saved_fd = os.dup(1)
+            os.dup2(devnull, 1)
+            os.close(devnull)
+            devnull_stdout = open(os.devnull, 'w')
+            sys.stdout = devnull_stdout
+        sys.stderr = new_stderr
 
-        # run the function
         try:
-            test_run.time = timeit.timeit(self._func, number=repeat)
-        except Exception as e:
-            # return stdout back to normal before passing the error
+            yield new_stdout, new_stderr
+        finally:
+            # put the screen output back to normal, even if the function raised
+            if devnull_stdout is not None:
+                devnull_stdout.close()
+            if saved_fd is not None:
+                os.dup2(saved_fd, 1)
+                os.close(saved_fd)
             sys.stdout = old_stdout
             sys.stderr = old_stderr
-            raise e
 
-        # get output of the function from our fake variable
-        test_run.stdout = sys.stdout.getvalue()
-        test_run.stderr = sys.stderr.getvalue()
+    def _make_timer(self, repeat: int) -> Callable[[], List[float]]:
+        # returns a function that times `outer_repeat` batches of calls
+        if self._setup_every_call and self._setup is not None:
+            setup_each = self._setup
+            return lambda: [self._time_each_call(repeat, setup_each) for _ in range(self._outer_repeat)]
 
-        # put the screen output back to normal
-        sys.stdout = old_stdout
-        sys.stderr = old_stderr
+        # bind the function to a local in the timer's setup so every call
+        # is a fast local lookup instead of a global/closure lookup
+        setup = '_f = _func; _setup()' if self._setup is not None else '_f = _func'
 
-        self.history.append(test_run)
+        # unroll the calls so timeit's own loop runs `unroll` times less
+        # often, using the largest unroll that still adds up to `repeat`
+        unroll = next(u for u in (Test.UNROLL, 4, 2, 1) if repeat % u == 0)
+        stmt = '; '.join(['_f()'] * unroll)
+        timer = timeit.Timer(stmt, setup=setup, globals={'_func': self._func, '_setup': self._setup})
+        return functools.partial(timer.repeat, repeat=self._outer_repeat, number=repeat // unroll)
 
-    def run(self, repeat: int = 100, name: str = None) -> TestRun:
+    def _time_each_call(self, repeat: int, setup: Callable) -> float:
+        # returns the total time of one batch of calls, calling setup (untimed)
+        # before each of them
+        func = self._func
+        timer = timeit.default_timer
+        total = 0.0
+        for _ in range(repeat):
+            setup()
+            start = timer()
+            func()
+            total += timer() - start
+        return total
+
+    def _run_traced(self, repeat: int, name: Optional[str]) -> float:
+        # returns the peak python allocation size (MiB) while running. the
+        # traced pass is thrown away since tracing skews its timing
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(1)
+        try:
+            peak = self._run(repeat, name, traced=True)
+        finally:
+            if started:
+                tracemalloc.stop()
+        self.history.pop()
+        return peak
+
+    def run(self, repeat: int = 100, name: Optional[str] = None, measure_memory: bool = True) -> TestRun:
         '''
         Run the test function `repeat` times. Returns a TestRun with memory
-        and timing information, and adds the TestRun to `Test.history`.
+        and timing information, and adds the TestRun to `Test.history`. Set
+        `measure_memory` to False to only time the function, skipping the
+        memory sampler altogether (`TestRun.memory` is then None).
         '''
         # don't run again while already running
         if self._running:
-            raise TestRunningException(f'Test "{self._func.__code__.co_name}" already running')
+            name = self.name or getattr(self._func, '__name__', '<function>')
+            raise TestRunningException(f'Test "{name}" already running')
+        if repeat < 1:
+            raise ValueError('repeat must be at least 1')
 
         self._running = True
-        mem_usage = None
+        mem_usage: List[float] = []
         name = name or self.name
+        backend = self._backend if measure_memory else None
+        runs_before = len(self.history)
 
         try:
-            mem_usage = memory_usage((self._run, (repeat,name)), interval=0.05)
-        except Exception as e:
-            # reset _running status before passing the error
+            if not measure_memory:
+                self._run(repeat, name)
+            elif backend == 'tracemalloc':
+                peak = self._run_traced(repeat, name)
+                self._run(repeat, name)
+            elif backend == 'memory_profiler':
+                mem_usage = memory_usage((self._run, (repeat,name)), interval=0.05)
+            else:
+                # sample a single pass, and if it was too short for the sampler
+                # to get enough slices, measure its memory with tracemalloc in
+                # an extra pass instead of sampling it again
+                mem_usage = memory_usage((self._run, (repeat,name)), interval=0.05, max_iterations=1)
+                backend = 'memory_profiler'
+                if len(mem_usage) < Test.MIN_SLICES:
+                    peak = self._run_traced(repeat, name)
+                    backend = 'tracemalloc'
+        finally:
+            # reset _running status, passing on any errors
             self._running = False
-            raise e
         
+        # memory_profiler re-runs the function with a shorter interval when it
+        # gets too few slices, so only keep the TestRun from the last pass
         test_run = self.history[-1]
-        test_run._mem_raw = mem_usage
+        del self.history[runs_before:-1]
+        test_run.backend = backend
+        if backend is None:
+            test_run._mem_raw = []
+        elif backend == 'tracemalloc':
+            test_run._set_peak(peak, 0.0)
+        elif self._keep_raw:
+            test_run._mem_raw = mem_usage
+        else:
+            # only the initial and peak slices matter, so reduce the samples
+            # instead of holding on to every one of them. the initial slice is
+            # one of the samples, so the peak can't be any lower than 0.0
+            initial = mem_usage[0]
+            peak = max(mem_usage) - initial
+            test_run._set_peak(peak, initial)
         history.add(test_run)
         return test_run
     
@@ -224,11 +625,61 @@ class Test:
     def last(self) -> TestRun:
         return self.history[-1]
 
-def run(func: Callable, repeat: int = 10, name: str = None) -> TestRun:
+def run(func: Callable, repeat: int = 10, name: Optional[str] = None, keep_raw: bool = False, jit: bool = False, outer_repeat: int = 5, capture_stdout: Union[bool, str] = True, setup: Optional[Callable] = None, backend: Optional[str] = None, args: tuple = (), kwargs: Optional[dict] = None, ring_size: int = 1024, measure_memory: bool = True, setup_every_call: bool = False) -> TestRun:
     '''
-    Run a function `repeat` times, returning a TestRun instance with average
-    time and memory usage. Also adds the TestRun to the module's history for
-    later use.
+    Run a function `repeat` times (in `outer_repeat` batches), returning a
+    TestRun instance with average time per call and memory usage. Also adds the
+    TestRun to the module's history for later use. Set `keep_raw` to store
+    every memory usage slice on the TestRun, `jit` to compile the function with
+    numba first, and `capture_stdout` to "ring" or "off" (False) to keep only
+    the last `ring_size` writes of output or discard it entirely. `setup` is
+    called before each timed batch (or each call, with `setup_every_call`)
+    without being timed, `backend` picks how memory is measured (or set
+    `measure_memory` to False to skip measuring it), and `args`/`kwargs` are
+    passed to the function on every call (see `Test`).
     '''
-    test_run = Test(func, repeat=repeat, name=name)
-    return test_run.run(repeat)
+    test_run = Test(func, repeat=repeat, name=name, keep_raw=keep_raw, jit=jit, outer_repeat=outer_repeat, capture_stdout=capture_stdout, setup=setup, backend=backend, args=args, kwargs=kwargs, ring_size=ring_size, setup_every_call=setup_every_call)
+    return test_run.run(repeat, measure_memory=measure_memory)
+
+def _run_remote(payload: bytes) -> Tuple[Any, ...]:
+    # runs in a worker process for `run_many()`, returning only the results
+    # since the TestRun itself (and its function) may not be picklable
+    func, repeat, options = pickle.loads(payload)
+    test_run = run(func, repeat=repeat, **options)
+    return (test_run.name, test_run.time, test_run._mem_raw, test_run._peak, test_run._initial, test_run.stdout, test_run.stderr, test_run.backend)
+
+def run_many(funcs: List[Callable], repeat: int = 10, workers: Optional[int] = None, **options: Any) -> List[TestRun]:
+    '''
+    Run each function in `funcs` `repeat` times like `run()`, but spread across
+    `workers` processes (defaults to the number of CPUs). Any other keyword
+    arguments are passed on to `run()`. Returns the TestRuns in the same order
+    as `funcs`, and adds them to the module's history.
+
+    The functions run at the same time, so the results are only comparable to
+    each other (or to `run()`) if they don't compete for the same resources,
+    e.g. memory bandwidth, disk or network, or more workers than CPU cores.
+    Where workers are started with "spawn" (Windows, and macOS by default),
+    each worker re-imports the calling script, so a script calling this at
+    the top level needs an `if __name__ == "__main__":` guard around it.
+    Lambdas and other functions that can't be pickled need `cloudpickle`.
+    '''
+    try:
+        import cloudpickle
+        dumps = cloudpickle.dumps
+    except ImportError:
+        dumps = pickle.dumps
+
+    payloads = [dumps((func, repeat, options)) for func in funcs]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = list(executor.map(_run_remote, payloads))
+
+    test_runs = []
+    for func, (name, time, mem_raw, peak, initial, stdout, stderr, backend) in zip(funcs, results):
+        test_run = TestRun(func, name=name, repeat=repeat, time=time, stdout=stdout, stderr=stderr, backend=backend)
+        if mem_raw or peak is None:
+            test_run._mem_raw = mem_raw
+        else:
+            test_run._set_peak(peak, initial)
+        history.add(test_run)
+        test_runs.append(test_run)
+    return test_runs
@@ -16,6 +16,12 @@ def populate_list(count: int = 20):
   for i in range(count):
     my_list.append(str(i))
 
+# populate_list() keeps appending to the same global
+# list, so without resetting it every call would be
+# working with more data than the last one
+def reset_list():
+  my_list.clear()
+
 def refill_list(count: int = 20):
   global filled_list
   max = len(filled_list)
@@ -53,26 +59,37 @@ print()
 
 # first argument is the function to test,
 # second argument (optional) is number of times
-# to run the method
+# to run the method.
+#
 ps = defbench.run(populate_set, repeat=10000)
 print(ps)
 print()
 
-# if you want, you can name the test
-pl = defbench.run(populate_list, repeat=10000, name="create list[20] x10000 ")
+# if a function changes some state it depends on (like
+# populate_list() growing my_list), pass a `setup`
+# function to reset it. it isn't included in the time,
+# and it's only called before each timed batch unless
+# `setup_every_call` is set, so here every call starts
+# with an empty list. you can also name the test
+pl = defbench.run(populate_list, repeat=10000, name="create list[20] x10000 ", setup=reset_list, setup_every_call=True)
 print(pl)
 print()
 
 # if you want to run a function with arguments,
-# create a lambda function like so:
-pl_args = defbench.run(lambda: populate_list(1000), repeat=100)
+# pass them with `args` and/or `kwargs`:
+pl_args = defbench.run(populate_list, repeat=100, args=(1000,), setup=reset_list)
 print(pl_args)
 print()
 
+# you can also create a lambda function like so:
+pl_lambda = defbench.run(lambda: populate_list(1000), repeat=100, setup=reset_list)
+print(pl_lambda)
+print()
+
 # notice that using lambda causes the function to be
 # named "<lambda>" in the output. you can use the name
 # parameter to fix that
-pl_named = defbench.run(lambda: populate_list(10000), repeat=100, name="populate list[10000]")
+pl_named = defbench.run(lambda: populate_list(10000), repeat=100, name="populate list[10000]", setup=reset_list)
 print(pl_named)
 print()
 